@@ -13,21 +13,26 @@
 ▪ 从键盘输入并输出到终端
 ▪ 至少两项高级技巧：
    ① 动态修改列表 / 字典等集合数据
-   ② 正则表达式进行非基础字符串校验
+   ② 字符串方法（str.isdecimal）进行非基础字符串校验
    ③ 第三方库 tabulate （若未安装自动降级）
 ▪ 充分的输入合法性检查，处理边界与异常
 ▪ 代码使用清晰的常量与注释；符合 PEP 8
 """
 
-import json
-import re
+import atexit
+import functools
+import os
 import sys
+import time
 from pathlib import Path
 
 # =========== 全局常量 =========== #
 DATA_FILE = Path("songs.json")             # 持久化文件
 TITLE_RANGE = (1, 90)                      # 标题/歌手字符长度限制
-INT_RE = re.compile(r"^\d+$")              # 正整数校验
+FLUSH_INTERVAL = 5.0                       # 批量写盘的最小间隔（秒）
+SONG_HEADER = ["歌曲", "艺术家", "播放次数"]   # 歌曲表格表头
+SONG_FIELDS = {"title", "artist", "plays"}  # 歌曲记录的标准字段
+PRETTY = False                             # 是否缩进输出 JSON（便于手工查看，写盘更慢）
 SAMPLE_DATA = [                            # 首次运行示例数据
     {"title": "Shape of You", "artist": "Ed Sheeran", "plays": 1560},
     {"title": "Blinding Lights", "artist": "The Weeknd", "plays": 1780},
@@ -36,30 +41,144 @@ SAMPLE_DATA = [                            # 首次运行示例数据
     {"title": "Levitating", "artist": "Dua Lipa", "plays": 980},
 ]
 
-# -------- tabulate：若缺失自动降级 -------- #
+
+# -------- tabulate：首次打印表格时才导入，若缺失自动降级 -------- #
+def _simple_tabulate(rows, headers, tablefmt="github"):  # 简陋备选实现
+    widths = [len(h) for h in headers]                   # 单次遍历求列宽，不做转置
+    for r in rows:
+        for i, c in enumerate(r):
+            n = len(c) if isinstance(c, str) else len(str(c))
+            if n > widths[i]:
+                widths[i] = n
+    line = "| " + " | ".join("-" * w for w in widths) + " |"
+    head = "| " + " | ".join(f"{h:<{w}}" for h, w in zip(headers, widths)) + " |"
+    body = ["| " + " | ".join(f"{c:<{w}}" for c, w in zip(r, widths)) + " |" for r in rows]
+    return "\n".join([line, head, line, *body, line])
+
+
+@functools.cache
+def _get_tabulate():
+    """延迟导入 tabulate（连带 wcwidth 等），只在第一次需要时付出导入开销。"""
+    try:
+        from tabulate import tabulate  # type: ignore
+    except ModuleNotFoundError:  # pragma: no cover
+        return _simple_tabulate
+    return tabulate
+
+
+# -------- orjson：若缺失自动降级为标准库 json -------- #
 try:
-    from tabulate import tabulate  # type: ignore
-except ModuleNotFoundError:  # pragma: no cover
-    def tabulate(rows, headers, tablefmt="github"):  # 简陋备选实现
-        widths = [max(len(str(c)) for c in col) for col in zip(*rows, headers)]
-        line = "| " + " | ".join("-" * w for w in widths) + " |"
-        head = "| " + " | ".join(f"{h:<{w}}" for h, w in zip(headers, widths)) + " |"
-        body = ["| " + " | ".join(f"{c:<{w}}" for c, w in zip(r, widths)) + " |" for r in rows]
-        return "\n".join([line, head, line, *body, line])
+    import orjson  # type: ignore
+
+    def _dumps(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if PRETTY else 0)
+        except orjson.JSONEncodeError:  # 超出 64 位的整数 orjson 无法编码，改用标准库
+            import json
+            return json.dumps(obj, ensure_ascii=False, indent=2 if PRETTY else None).encode("utf-8")
+
+    def _loads(data):
+        obj = orjson.loads(data)
+        # orjson 会把超出 64 位的整数读成 float；遇到 float 时改用标准库重新解析，保留精确整数
+        if any(isinstance(s.get("plays"), float) for s in obj):
+            import json
+            return json.loads(data)
+        return obj
+except ModuleNotFoundError:
+    import json  # 仅在缺少 orjson 时才导入标准库 json
+
+    def _dumps(obj):
+        # 只有每条记录都恰好是 {title, artist, plays} 且 plays 为 int 时才走快速写出，
+        # 否则交给标准库原样保存（额外字段、非整数播放量都不丢失）
+        if not PRETTY and all(s.keys() == SONG_FIELDS and type(s["plays"]) is int for s in obj):
+            return dump_songs_fast(obj)
+        return json.dumps(obj, ensure_ascii=False, indent=2 if PRETTY else None).encode("utf-8")
+
+    _loads = json.loads
 
 
 # =========== 数据存取 =========== #
 def load_songs():
     """读取歌曲记录；若无文件则写入示例数据。"""
     if DATA_FILE.exists():
-        return json.loads(DATA_FILE.read_text(encoding="utf-8"))
-    DATA_FILE.write_text(json.dumps(SAMPLE_DATA, ensure_ascii=False, indent=2), encoding="utf-8")
+        return _loads(DATA_FILE.read_bytes())
+    save_songs(SAMPLE_DATA)
     return SAMPLE_DATA.copy()
 
 
-def save_songs(songs):
-    """保存歌曲记录到本地 JSON。"""
-    DATA_FILE.write_text(json.dumps(songs, ensure_ascii=False, indent=2), encoding="utf-8")
+def save_songs(songs, sync=False):
+    """保存歌曲记录到本地 JSON：先写临时文件再原子替换，中途崩溃不会损坏原文件。
+
+    sync=True 时在替换前 fsync 临时文件、替换后 fsync 所在目录，确保结果真正落盘；
+    开销较大，只在退出时使用。
+    """
+    payload = _dumps(songs)     # 先完成序列化，编码出错时不会留下空的临时文件
+    tmp = DATA_FILE.with_suffix(".json.tmp")
+    with open(tmp, "wb") as f:
+        f.write(payload)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, DATA_FILE)
+    if sync:
+        _fsync_dir(DATA_FILE.parent)
+
+
+def _fsync_dir(path):
+    """fsync 目录，使 os.replace 的重命名持久化；Windows 无法对目录 fsync，直接跳过。"""
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def dump_songs_fast(songs):
+    """按固定结构 {title, artist, plays} 直接拼接 JSON，省去通用编码器的逐项类型判断。
+
+    调用方需保证每条记录恰好只有这三个字段且 plays 为 int，否则应使用通用编码器。
+    """
+    from json.encoder import encode_basestring as _json_str  # 字符串转 JSON 字面量（保留非 ASCII）
+
+    body = ",".join(
+        f'{{"title":{_json_str(s["title"])},"artist":{_json_str(s["artist"])},"plays":{s["plays"]}}}'
+        for s in songs
+    )
+    return f"[{body}]".encode("utf-8")
+
+
+# -------- 批量写盘：修改只打标记，定期 / 退出时统一落盘 -------- #
+_dirty = False          # 内存数据是否有未保存的修改
+_version = 0            # 修改计数，用于判断缓存的表格是否过期
+_last_flush = 0.0       # 上次写盘时间（time.monotonic）
+_unsynced = False       # 是否有已写盘但尚未 fsync 的数据
+_shut_down = False      # shutdown 是否已执行（菜单退出与 atexit 只处理一次）
+
+
+def flush(songs, sync=False):
+    """若存在未保存的修改，立即写盘；sync=True 时连同尚未 fsync 的数据一起强制落盘。"""
+    global _dirty, _last_flush, _unsynced
+    if _dirty or (sync and _unsynced):
+        save_songs(songs, sync=sync)
+        _dirty = False
+        _unsynced = not sync
+        _last_flush = time.monotonic()
+
+
+def maybe_flush(songs):
+    """距上次写盘超过 FLUSH_INTERVAL 秒才真正写盘。"""
+    if time.monotonic() - _last_flush > FLUSH_INTERVAL:
+        flush(songs)
+
+
+def mark_dirty(songs):
+    """标记数据已修改，并按需写盘。"""
+    global _dirty, _version
+    _dirty = True
+    _version += 1
+    maybe_flush(songs)
 
 
 # =========== 输入校验 =========== #
@@ -77,89 +196,151 @@ def ask_int(prompt):
     """正整数输入校验。"""
     while True:
         val = input(prompt).strip()
-        if INT_RE.fullmatch(val):
+        if val.isdecimal():     # 与正则 ^\d+$ 等价，且无需经过正则引擎
             return int(val)
         print("＞ 请输入非负整数！")
 
 
+def ask_title_artist():
+    """依次输入歌曲名称与歌手名称。"""
+    return ask_text("输入歌曲名称："), ask_text("输入歌手名称：")
+
+
 # =========== 辅助逻辑 =========== #
-def find_song(songs, title, artist):
-    """按标题+歌手查找（忽略大小写），存在返回索引，否则 -1。"""
-    title, artist = title.lower(), artist.lower()
-    for i, s in enumerate(songs):
-        if s["title"].lower() == title and s["artist"].lower() == artist:
-            return i
-    return -1
+SONGS_BY_KEY = {}       # (标题小写, 歌手小写) -> 歌曲记录，用于 O(1) 查找
+DUPLICATES_BY_KEY = {}  # 同一键下排在后面的重复记录（仅手工编辑的文件会出现）
+
+
+def song_key(title, artist):
+    """索引键：标题与歌手统一转小写，每次操作只计算一次。"""
+    return title.lower(), artist.lower()
+
+
+def build_index(songs):
+    """根据歌曲列表重建查找索引。"""
+    SONGS_BY_KEY.clear()
+    DUPLICATES_BY_KEY.clear()
+    for s in songs:     # 大小写重复时保留第一条，与逐项扫描的查找结果一致
+        key = song_key(s["title"], s["artist"])
+        if key in SONGS_BY_KEY:
+            DUPLICATES_BY_KEY.setdefault(key, []).append(s)
+        else:
+            SONGS_BY_KEY[key] = s
+
+
+def find_song(title, artist):
+    """按标题+歌手查找（忽略大小写），存在返回歌曲记录，否则 None。"""
+    return SONGS_BY_KEY.get(song_key(title, artist))
+
+
+def format_table(rows, header):
+    """生成表格文本；空列表时返回提示语。"""
+    if rows:
+        return _get_tabulate()(rows, header, tablefmt="github") + "\n"
+    return "♪ 歌曲列表为空。\n"
 
 
 def show_table(rows, header):
     """打印表格；空列表时给出提示。"""
-    if rows:
-        print(tabulate(rows, header, tablefmt="github"), end="\n\n")
-    else:
-        print("♪ 歌曲列表为空。\n")
+    print(format_table(rows, header))
 
 
 # =========== 核心功能 =========== #
+_table_cache = (None, "")   # ((列表 id, 长度, 修改计数), 已渲染的表格文本)
+
+
 def print_all(songs):
-    show_table([[s["title"], s["artist"], s["plays"]] for s in songs],
-               ["歌曲", "艺术家", "播放次数"])
+    """打印全部歌曲；数据未修改时直接复用上次渲染的表格。"""
+    global _table_cache
+    key = (id(songs), len(songs), _version)
+    if _table_cache[0] != key:
+        rows = [(s["title"], s["artist"], s["plays"]) for s in songs]
+        _table_cache = (key, format_table(rows, SONG_HEADER))
+    print(_table_cache[1])
 
 
 def add_song(songs):
     print("\n--- 添加歌曲 ---")
-    title = ask_text("输入歌曲名称：")
-    artist = ask_text("输入歌手名称：")
-    if find_song(songs, title, artist) != -1:
+    title, artist = ask_title_artist()
+    key = song_key(title, artist)
+    if key in SONGS_BY_KEY:
         print("＞ 该歌曲已存在，若需修改播放量请选 3。\n")
         return
     plays = ask_int("输入播放次数：")
-    songs.append({"title": title, "artist": artist, "plays": plays})
-    save_songs(songs)
+    song = {"title": title, "artist": artist, "plays": plays}
+    songs.append(song)
+    SONGS_BY_KEY[key] = song
+    mark_dirty(songs)
     print("✓ 添加成功！\n")
 
 
 def edit_song(songs):
     print("\n--- 修改播放次数 ---")
-    title = ask_text("输入歌曲名称：")
-    artist = ask_text("输入歌手名称：")
-    idx = find_song(songs, title, artist)
-    if idx == -1:
+    title, artist = ask_title_artist()
+    song = find_song(title, artist)
+    if song is None:
         print("＞ 未找到该歌曲。\n")
         return
-    new_plays = ask_int(f"当前播放 {songs[idx]['plays']} 次，输入新的播放次数：")
-    songs[idx]["plays"] = new_plays
-    save_songs(songs)
+    new_plays = ask_int(f"当前播放 {song['plays']} 次，输入新的播放次数：")
+    song["plays"] = new_plays
+    mark_dirty(songs)
     print("✓ 修改成功！\n")
 
 
 def delete_song(songs):
     print("\n--- 删除歌曲 ---")
-    title = ask_text("输入歌曲名称：")
-    artist = ask_text("输入歌手名称：")
-    idx = find_song(songs, title, artist)
-    if idx == -1:
+    title, artist = ask_title_artist()
+    key = song_key(title, artist)
+    song = SONGS_BY_KEY.pop(key, None)
+    if song is None:
         print("＞ 未找到该歌曲。\n")
         return
-    songs.pop(idx)
-    save_songs(songs)
+    songs.pop(next(i for i, s in enumerate(songs) if s is song))   # 按身份删除，而非按值比较
+    # 若该键还有仅大小写不同的重复记录，由下一条接替成为查找结果
+    dups = DUPLICATES_BY_KEY.get(key)
+    if dups:
+        SONGS_BY_KEY[key] = dups.pop(0)
+        if not dups:
+            del DUPLICATES_BY_KEY[key]
+    mark_dirty(songs)
     print("✓ 删除成功！\n")
 
 
 def generate_playlist(songs):
     print("\n--- 生成播放列表 ---")
     min_plays = ask_int("输入最小播放次数：")
-    filtered = [s for s in songs if s["plays"] >= min_plays]
-    if not filtered:
+    # 筛选与生成表格行合并为一次遍历，不再构造中间列表
+    rows = [(s["title"], s["artist"], s["plays"]) for s in songs if s["plays"] >= min_plays]
+    if not rows:
         print("＞ 没有歌曲符合条件。\n")
     else:
         print(f"符合 ≥{min_plays} 次的歌曲：")
-        print_all(filtered)
+        show_table(rows, SONG_HEADER)
+
+
+def shutdown(songs):
+    """写入未保存的修改并强制落盘；磁盘出错时只给出提示，不让退出流程失败。"""
+    global _shut_down
+    if _shut_down:
+        return
+    _shut_down = True
+    try:
+        flush(songs, sync=True)
+    except OSError as e:
+        print(f"＞ 保存失败：{e}")
+
+
+def quit_app(songs):
+    """退出前先把未保存的修改写盘。"""
+    shutdown(songs)
+    sys.exit("👋 感谢使用，再见！")
 
 
 # =========== 主循环 =========== #
 def main():
     songs = load_songs()
+    build_index(songs)
+    atexit.register(shutdown, songs)  # 异常 / Ctrl+C 退出时兜底写盘
     menu = """
 ==================  菜  单  ==================
 1. 打印所有歌曲
@@ -176,7 +357,7 @@ def main():
         "3": lambda: edit_song(songs),
         "4": lambda: delete_song(songs),
         "5": lambda: generate_playlist(songs),
-        "6": lambda: sys.exit("👋 感谢使用，再见！"),
+        "6": lambda: quit_app(songs),
     }
 
     while True: